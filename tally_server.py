@@ -1,25 +1,140 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+try:
+    from lxml import etree as ET
+    # Tally responses never need entity expansion or oversized text nodes
+    _ITERPARSE_OPTIONS = {'resolve_entities': False, 'huge_tree': False}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _ITERPARSE_OPTIONS = {}
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
+from xml.sax.saxutils import escape
+import calendar
+import functools
+import itertools
+import os
 import random
 import re
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
 CORS(app)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 TALLY_URL = "http://localhost:9000"
 
+_DATE_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+
+# Shared session so Tally calls reuse pooled keep-alive connections
+TALLY_SESSION = requests.Session()
+TALLY_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+# Bodies are always posted as bytes, so requests sends a fixed Content-Length
+# with no chunked encoding or Expect: 100-continue round trip
+TALLY_SESSION.headers.update({
+    'Content-Type': 'application/xml; charset=utf-8',
+    'Connection': 'keep-alive',
+})
+
+# Large /create-vouchers batches are sent in envelopes of this many vouchers,
+# with the next envelope built on EXECUTOR while Tally imports the current one
+BATCH_CHUNK_SIZE = 25
+EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Company list changes rarely, so /get-companies serves it from memory briefly
+COMPANIES_CACHE_TTL = 30
+_companies_cache = {'t': 0, 'v': []}
+_companies_lock = threading.Lock()
+
 def round_decimal(value, places=2):
     """Round using Decimal for precision matching Tally's rounding"""
     d = Decimal(str(value))
     return float(d.quantize(Decimal(10) ** -places, rounding=ROUND_HALF_UP))
 
-def get_company_list():
-    """Fetch list of companies from TallyPrime"""
-    xml_request = '''<?xml version="1.0" encoding="UTF-8"?>
+def tag(name, text):
+    """Render a simple <name>text</name> element with escaped text"""
+    return f'<{name}>{escape(text)}</{name}>'
+
+# Voucher fields that never vary, rendered once at import time
+_BOOL_FLAGS_ITEMS = (
+    ('DIFFACTUALQTY', 'No'), ('ISMSTFROMSYNC', 'No'), ('ISDELETED', 'No'),
+    ('ISSECURITYONWHENENTERED', 'No'), ('ASORIGINAL', 'No'), ('AUDITED', 'No'),
+    ('FORJOBCOSTING', 'No'), ('ISOPTIONAL', 'No'), ('USEFOREXCISE', 'No'),
+    ('ISFORJOBWORKIN', 'No'), ('ALLOWCONSUMPTION', 'No'), ('USEFORINTEREST', 'No'),
+    ('USEFORGAINLOSS', 'No'), ('USEFORGODOWNTRANSFER', 'No'), ('USEFORCOMPOUND', 'No'),
+    ('ISREVERSECHARGEAPPLICABLE', 'No'), ('ISINVOICE', 'Yes'), ('ISOVERSEASTOURISTTRANS', 'No')
+)
+_BOOL_FLAGS_XML = ''.join(tag(key, val) for key, val in _BOOL_FLAGS_ITEMS)
+
+_VOUCHER_TYPE_XML = ''.join(tag(key, val) for key, val in (
+    ('GSTREGISTRATIONTYPE', 'Unregistered/Consumer'),
+    ('STATENAME', 'Maharashtra'),
+    ('COUNTRYOFRESIDENCE', 'India'),
+    ('PLACEOFSUPPLY', 'Maharashtra'),
+    ('VOUCHERTYPENAME', 'Retail Sale'),
+))
+_CONSIGNEE_XML = ''.join(tag(key, val) for key, val in (
+    ('CONSIGNEESTATENAME', 'Maharashtra'),
+    ('CONSIGNEECOUNTRYNAME', 'India'),
+))
+_VOUCHER_VIEW_XML = ''.join(tag(key, val) for key, val in (
+    ('PERSISTEDVIEW', 'Invoice Voucher View'),
+    ('VCHENTRYMODE', 'Item Invoice'),
+))
+
+# Constant runs inside inventory and ledger entries
+_STOCK_ITEM_FLAGS_XML = tag('ISDEEMEDPOSITIVE', 'No')
+_BATCH_HEAD_XML = ''.join(tag(key, val) for key, val in (
+    ('GODOWNNAME', 'Main Location'),
+    ('BATCHNAME', 'Primary Batch'),
+    ('DESTINATIONGODOWNNAME', 'Main Location'),
+))
+_SALES_ALLOCATION_HEAD_XML = tag('LEDGERNAME', 'SALES GST') + tag('ISDEEMEDPOSITIVE', 'No')
+_PARTY_LEDGER_FLAGS_XML = tag('ISDEEMEDPOSITIVE', 'Yes') + tag('ISPARTYLEDGER', 'Yes')
+_GST_LEDGER_FLAGS_XML = tag('METHODTYPE', 'GST') + tag('ISDEEMEDPOSITIVE', 'No')
+_ROUND_OFF_HEAD_XML = ''.join(tag(key, val) for key, val in (
+    ('ROUNDTYPE', 'Normal Rounding'),
+    ('LEDGERNAME', 'Round Up/Down'),
+    ('METHODTYPE', 'As Total Amount Rounding'),
+    ('ISDEEMEDPOSITIVE', 'No'),
+    ('ROUNDLIMIT', ' 1'),
+))
+
+# GST duty heads with their share of the item's GST rate
+_RATE_DETAIL_HEADS = (('CGST', 2), ('SGST/UTGST', 2), ('IGST', 1))
+
+@functools.lru_cache(maxsize=32)
+def _rate_details_xml(gst_rate):
+    """RATEDETAILS.LIST blocks for one GST rate, rendered once per rate"""
+    return ''.join(
+        f'<RATEDETAILS.LIST>{tag("GSTRATEDUTYHEAD", duty_head)}'
+        f'{tag("GSTRATEVALUATIONTYPE", "Based on Value")}'
+        f'<GSTRATE> {gst_rate / divisor:.0f}</GSTRATE></RATEDETAILS.LIST>'
+        for duty_head, divisor in _RATE_DETAIL_HEADS
+    )
+
+# Export request for the company collection, encoded once
+COMPANY_LIST_REQUEST = '''<?xml version="1.0" encoding="UTF-8"?>
 <ENVELOPE>
     <HEADER>
         <VERSION>1</VERSION>
@@ -42,76 +157,139 @@ def get_company_list():
             </TDL>
         </DESC>
     </BODY>
-</ENVELOPE>'''
-    
+</ENVELOPE>'''.encode('utf-8')
+
+def fetch_company_list():
+    """Fetch list of companies from TallyPrime"""
     try:
-        response = requests.post(
+        response = TALLY_SESSION.post(
             TALLY_URL,
-            data=xml_request.encode('utf-8'),
-            headers={'Content-Type': 'application/xml; charset=utf-8'},
-            timeout=5
+            data=COMPANY_LIST_REQUEST,
+            timeout=5,
+            stream=True
         )
         
-        if response.status_code == 200:
-            root = ET.fromstring(response.text)
-            companies = []
-            
-            for company in root.findall('.//COMPANY'):
-                name_elem = company.find('NAME')
-                if name_elem is not None and name_elem.text:
-                    companies.append(name_elem.text.strip())
-            
-            return companies
-        return []
+        with response:
+            if response.status_code == 200:
+                response.raw.decode_content = True
+                companies = []
+                
+                # Stream-parse so large company lists never build a full tree:
+                # each COMPANY is detached from its parent once its name is read
+                open_elems = []
+                for event, elem in ET.iterparse(response.raw, events=('start', 'end'), **_ITERPARSE_OPTIONS):
+                    if event == 'start':
+                        open_elems.append(elem)
+                        continue
+                    open_elems.pop()
+                    if elem.tag == 'COMPANY':
+                        name = elem.findtext('NAME')
+                        if name:
+                            companies.append(name.strip())
+                        elem.clear()
+                        if open_elems:
+                            open_elems[-1].remove(elem)
+                
+                return companies
+            return []
     except Exception as e:
         print(f"Error fetching companies: {e}")
         return []
 
+def get_company_list():
+    """Company list from TallyPrime, cached for COMPANIES_CACHE_TTL seconds"""
+    with _companies_lock:
+        if _companies_cache['v'] and time.monotonic() - _companies_cache['t'] < COMPANIES_CACHE_TTL:
+            return list(_companies_cache['v'])
+    
+    companies = fetch_company_list()
+    # Only cache successful lookups so a disconnected Tally is retried
+    if companies:
+        with _companies_lock:
+            _companies_cache['t'] = time.monotonic()
+            _companies_cache['v'] = companies
+    return list(companies)
+
+def invalidate_company_cache():
+    """Drop the cached company list so the next lookup asks Tally"""
+    with _companies_lock:
+        _companies_cache['t'] = 0
+        _companies_cache['v'] = []
+
+def to_tally_date(date):
+    """Convert YYYY-MM-DD to Tally's YYYYMMDD, parsing fully only for unusual input"""
+    match = _DATE_RE.fullmatch(date)
+    if match:
+        year, month, day = map(int, match.groups())
+        if year >= 1 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]:
+            return date.replace('-', '')
+    # strptime accepts single-digit fields and raises ValueError for impossible dates
+    return datetime.strptime(date, '%Y-%m-%d').strftime('%Y%m%d')
+
+# Sequential 4-digit voucher suffixes from a random per-process start
+_vch_counter = itertools.count(random.randint(1000, 9999))
+
+@functools.lru_cache(maxsize=8)
+def _voucher_prefix(year):
+    """Voucher number prefix RS-YY/YY- for a calendar year"""
+    return f"RS-{year % 100:02d}/{(year + 1) % 100:02d}-"
+
 def generate_voucher_number():
     """Generate voucher number in format RS-YY/YY-NNNN"""
-    now = datetime.now()
-    year = now.year % 100
-    next_year = (now.year + 1) % 100
-    number = random.randint(1000, 9999)
-    return f"RS-{year:02d}/{next_year:02d}-{number}"
+    number = 1000 + next(_vch_counter) % 9000
+    return f"{_voucher_prefix(datetime.now().year)}{number}"
 
-def calculate_amounts_precise(qty, rate_incl_gst, gst_rate):
-    """
-    Calculate amounts with precision matching Tally's expectations.
-    Uses Decimal for exact calculations matching the sample XML.
-    """
-    qty_dec = Decimal(str(qty))
-    rate_incl_dec = Decimal(str(rate_incl_gst))
-    gst_rate_dec = Decimal(str(gst_rate))
-    
-    # Total amount (inclusive of GST)
-    total_amount = qty_dec * rate_incl_dec
+def _div_round_half_up(numerator, denominator):
+    """Integer division rounding halves away from zero (Decimal ROUND_HALF_UP)"""
+    quotient = (2 * abs(numerator) + abs(denominator)) // (2 * abs(denominator))
+    return quotient if (numerator >= 0) == (denominator > 0) else -quotient
+
+@functools.lru_cache(maxsize=4096)
+def _calc_cached(qty_milli, rate_paisa, gst_bp):
+    """Integer core of calculate_amounts_precise, memoized per (qty, rate, GST)"""
+    # Total amount (inclusive of GST), in thousandths of a paisa
+    total_milli = qty_milli * rate_paisa
     
     # Calculate base amount (exclusive of GST)
-    divisor = Decimal('1') + (gst_rate_dec / Decimal('100'))
-    base_amount = total_amount / divisor
-    base_amount = base_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    base_paisa = _div_round_half_up(total_milli * 10000, 1000 * (10000 + gst_bp))
     
     # Calculate GST amount
-    gst_amount = total_amount - base_amount
-    gst_amount = gst_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    gst_paisa = _div_round_half_up(total_milli - base_paisa * 1000, 1000)
     
     # Calculate base rate per piece
-    base_rate = base_amount / qty_dec
-    base_rate = base_rate.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    base_rate_paisa = _div_round_half_up(base_paisa * 1000, qty_milli)
+    
+    return base_paisa, gst_paisa, base_rate_paisa, total_milli
+
+def paisa_str(paisa):
+    """Format an integer paisa amount as rupees with two decimals"""
+    rupees, paise = divmod(abs(paisa), 100)
+    return f"{'-' if paisa < 0 else ''}{rupees}.{paise:02d}"
+
+def _calc_keys(qty, rate_incl_gst, gst_rate):
+    """Normalize inputs to (quantity in thousandths, rate in paisa, GST in basis points)"""
+    return int(round(qty * 1000)), int(round(rate_incl_gst * 100)), int(round(gst_rate * 100))
+
+def calculate_amounts_precise(qty, rate_incl_gst, gst_rate):
+    """
+    Calculate amounts with precision matching Tally's expectations.
+    Works in integer paisa (quantity in thousandths, GST in basis points)
+    so rounding is exact without Decimal overhead.
+    """
+    qty_milli, rate_paisa, gst_bp = _calc_keys(qty, rate_incl_gst, gst_rate)
+    base_paisa, gst_paisa, base_rate_paisa, total_milli = _calc_cached(qty_milli, rate_paisa, gst_bp)
     
     return {
-        'base_amount': float(base_amount),
-        'gst_amount': float(gst_amount),
-        'base_rate': float(base_rate),
-        'total_amount': float(total_amount),
-        'rate_incl_gst': float(rate_incl_dec)
+        'base_amount': base_paisa / 100.0,
+        'gst_amount': gst_paisa / 100.0,
+        'base_rate': base_rate_paisa / 100.0,
+        'total_amount': total_milli / 100000.0,
+        'rate_incl_gst': rate_paisa / 100.0
     }
 
-def create_retail_sale_xml(voucher_data):
-    """Generate XML for Retail Sale voucher matching Tally's exact format"""
+def build_voucher_body(voucher_data):
+    """Generate the TALLYMESSAGE block for one Retail Sale voucher"""
     
-    company_name = voucher_data.get('companyName', '')
     party_name = voucher_data['partyName']
     customer_name = voucher_data['customerName']
     address = voucher_data.get('address', '')
@@ -119,15 +297,13 @@ def create_retail_sale_xml(voucher_data):
     date = voucher_data['date']
     items = voucher_data['items']
     
-    date_obj = datetime.strptime(date, '%Y-%m-%d')
-    tally_date = date_obj.strftime('%Y%m%d')
+    tally_date = to_tally_date(date)
     
     voucher_number = generate_voucher_number()
     
-    # Calculate totals using precise decimal arithmetic
-    subtotal = Decimal('0')
-    cgst_total = Decimal('0')
-    sgst_total = Decimal('0')
+    # Calculate totals in integer paisa
+    subtotal = 0
+    gst_total = 0
     
     items_calculated = []
     
@@ -137,202 +313,254 @@ def create_retail_sale_xml(voucher_data):
         gst_rate = float(item['gstRate'])
         
         # Use precise calculation
-        calc = calculate_amounts_precise(qty, rate_incl, gst_rate)
+        qty_milli, rate_paisa, gst_bp = _calc_keys(qty, rate_incl, gst_rate)
+        base_paisa, gst_paisa, base_rate_paisa, _ = _calc_cached(qty_milli, rate_paisa, gst_bp)
         
         items_calculated.append({
             'name': item['name'],
             'imei': item.get('imei', ''),
             'quantity': qty,
-            'rate_incl_gst': calc['rate_incl_gst'],
             'gst_rate': gst_rate,
-            'base_amount': calc['base_amount'],
-            'gst_amount': calc['gst_amount'],
-            'base_rate': calc['base_rate']
+            'base_paisa': base_paisa,
+            'base_rate_paisa': base_rate_paisa,
+            'rate_paisa': rate_paisa
         })
         
-        subtotal += Decimal(str(calc['base_amount']))
-        gst_amt = Decimal(str(calc['gst_amount']))
-        cgst_total += gst_amt / Decimal('2')
-        sgst_total += gst_amt / Decimal('2')
+        subtotal += base_paisa
+        gst_total += gst_paisa
     
-    # Round CGST and SGST
-    cgst_total = cgst_total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    sgst_total = sgst_total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    subtotal = subtotal.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    # Split GST evenly into CGST and SGST
+    cgst_total = _div_round_half_up(gst_total, 2)
+    sgst_total = cgst_total
     
     total = subtotal + cgst_total + sgst_total
-    rounded_total = round(float(total))
-    round_off = Decimal(str(rounded_total)) - total
-    round_off = round_off.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    
-    # Convert to float
-    subtotal_float = float(subtotal)
-    cgst_float = float(cgst_total)
-    sgst_float = float(sgst_total)
-    round_off_float = float(round_off)
-    
-    envelope = ET.Element('ENVELOPE')
-    
-    header = ET.SubElement(envelope, 'HEADER')
-    ET.SubElement(header, 'TALLYREQUEST').text = 'Import Data'
-    
-    body = ET.SubElement(envelope, 'BODY')
-    import_data = ET.SubElement(body, 'IMPORTDATA')
-    
-    request_desc = ET.SubElement(import_data, 'REQUESTDESC')
-    ET.SubElement(request_desc, 'REPORTNAME').text = 'Vouchers'
-    static_vars = ET.SubElement(request_desc, 'STATICVARIABLES')
-    
-    if company_name:
-        ET.SubElement(static_vars, 'SVCURRENTCOMPANY').text = company_name
-    
-    request_data = ET.SubElement(import_data, 'REQUESTDATA')
+    rounded_total = round(total / 100)
+    round_off = rounded_total * 100 - total
     
-    tallymsg = ET.SubElement(request_data, 'TALLYMESSAGE')
-    tallymsg.set('xmlns:UDF', 'TallyUDF')
-    
-    voucher = ET.SubElement(tallymsg, 'VOUCHER')
-    voucher.set('REMOTEID', '')
-    voucher.set('VCHKEY', '')
-    voucher.set('VCHTYPE', 'Retail Sale')
-    voucher.set('ACTION', 'Create')
-    voucher.set('OBJVIEW', 'Invoice Voucher View')
+    parts = ['<TALLYMESSAGE xmlns:UDF="TallyUDF">'
+             '<VOUCHER REMOTEID="" VCHKEY="" VCHTYPE="Retail Sale" ACTION="Create" OBJVIEW="Invoice Voucher View">']
     
     if address or phone:
-        addr_list = ET.SubElement(voucher, 'ADDRESS.LIST')
-        addr_list.set('TYPE', 'String')
+        parts.append('<ADDRESS.LIST TYPE="String">')
         if address:
-            ET.SubElement(addr_list, 'ADDRESS').text = address
+            parts.append(tag('ADDRESS', address))
         if phone:
-            ET.SubElement(addr_list, 'ADDRESS').text = phone
+            parts.append(tag('ADDRESS', phone))
+        parts.append('</ADDRESS.LIST>')
     
     if address:
-        buyer_addr = ET.SubElement(voucher, 'BASICBUYERADDRESS.LIST')
-        buyer_addr.set('TYPE', 'String')
-        ET.SubElement(buyer_addr, 'BASICBUYERADDRESS').text = address
-    
-    old_audit = ET.SubElement(voucher, 'OLDAUDITENTRYIDS.LIST')
-    old_audit.set('TYPE', 'Number')
-    ET.SubElement(old_audit, 'OLDAUDITENTRYIDS').text = '-1'
-    
-    ET.SubElement(voucher, 'DATE').text = tally_date
-    ET.SubElement(voucher, 'VCHSTATUSDATE').text = tally_date
-    ET.SubElement(voucher, 'GSTREGISTRATIONTYPE').text = 'Unregistered/Consumer'
-    ET.SubElement(voucher, 'STATENAME').text = 'Maharashtra'
-    ET.SubElement(voucher, 'COUNTRYOFRESIDENCE').text = 'India'
-    ET.SubElement(voucher, 'PLACEOFSUPPLY').text = 'Maharashtra'
-    ET.SubElement(voucher, 'VOUCHERTYPENAME').text = 'Retail Sale'
-    ET.SubElement(voucher, 'PARTYNAME').text = customer_name
-    ET.SubElement(voucher, 'PARTYLEDGERNAME').text = party_name
-    ET.SubElement(voucher, 'VOUCHERNUMBER').text = voucher_number
-    ET.SubElement(voucher, 'BASICBUYERNAME').text = party_name
-    ET.SubElement(voucher, 'PARTYMAILINGNAME').text = customer_name
-    ET.SubElement(voucher, 'CONSIGNEEMAILINGNAME').text = party_name
-    ET.SubElement(voucher, 'CONSIGNEESTATENAME').text = 'Maharashtra'
-    ET.SubElement(voucher, 'CONSIGNEECOUNTRYNAME').text = 'India'
-    ET.SubElement(voucher, 'BASICBASEPARTYNAME').text = party_name
-    ET.SubElement(voucher, 'PERSISTEDVIEW').text = 'Invoice Voucher View'
-    ET.SubElement(voucher, 'VCHENTRYMODE').text = 'Item Invoice'
-    ET.SubElement(voucher, 'EFFECTIVEDATE').text = tally_date
-    
-    bool_flags = {
-        'DIFFACTUALQTY': 'No', 'ISMSTFROMSYNC': 'No', 'ISDELETED': 'No',
-        'ISSECURITYONWHENENTERED': 'No', 'ASORIGINAL': 'No', 'AUDITED': 'No',
-        'FORJOBCOSTING': 'No', 'ISOPTIONAL': 'No', 'USEFOREXCISE': 'No',
-        'ISFORJOBWORKIN': 'No', 'ALLOWCONSUMPTION': 'No', 'USEFORINTEREST': 'No',
-        'USEFORGAINLOSS': 'No', 'USEFORGODOWNTRANSFER': 'No', 'USEFORCOMPOUND': 'No',
-        'ISREVERSECHARGEAPPLICABLE': 'No', 'ISINVOICE': 'Yes', 'ISOVERSEASTOURISTTRANS': 'No'
-    }
-    for key, val in bool_flags.items():
-        ET.SubElement(voucher, key).text = val
+        parts.append('<BASICBUYERADDRESS.LIST TYPE="String">')
+        parts.append(tag('BASICBUYERADDRESS', address))
+        parts.append('</BASICBUYERADDRESS.LIST>')
+    
+    parts.append('<OLDAUDITENTRYIDS.LIST TYPE="Number"><OLDAUDITENTRYIDS>-1</OLDAUDITENTRYIDS></OLDAUDITENTRYIDS.LIST>')
+    
+    parts.append(tag('DATE', tally_date))
+    parts.append(tag('VCHSTATUSDATE', tally_date))
+    parts.append(_VOUCHER_TYPE_XML)
+    parts.append(tag('PARTYNAME', customer_name))
+    parts.append(tag('PARTYLEDGERNAME', party_name))
+    parts.append(tag('VOUCHERNUMBER', voucher_number))
+    parts.append(tag('BASICBUYERNAME', party_name))
+    parts.append(tag('PARTYMAILINGNAME', customer_name))
+    parts.append(tag('CONSIGNEEMAILINGNAME', party_name))
+    parts.append(_CONSIGNEE_XML)
+    parts.append(tag('BASICBASEPARTYNAME', party_name))
+    parts.append(_VOUCHER_VIEW_XML)
+    parts.append(tag('EFFECTIVEDATE', tally_date))
+    
+    parts.append(_BOOL_FLAGS_XML)
     
     # Add inventory entries
     for item_calc in items_calculated:
-        inv_entry = ET.SubElement(voucher, 'ALLINVENTORYENTRIES.LIST')
+        parts.append('<ALLINVENTORYENTRIES.LIST>')
         
         if item_calc['imei']:
-            basic_desc = ET.SubElement(inv_entry, 'BASICUSERDESCRIPTION.LIST')
-            basic_desc.set('TYPE', 'String')
-            ET.SubElement(basic_desc, 'BASICUSERDESCRIPTION').text = item_calc['imei']
+            parts.append('<BASICUSERDESCRIPTION.LIST TYPE="String">')
+            parts.append(tag('BASICUSERDESCRIPTION', item_calc['imei']))
+            parts.append('</BASICUSERDESCRIPTION.LIST>')
         
-        qty = item_calc['quantity']
-        base_rate = item_calc['base_rate']
-        base_amount = item_calc['base_amount']
-        rate_incl = item_calc['rate_incl_gst']
+        qty = f' {round(item_calc["quantity"])} Pcs'
+        base_rate = paisa_str(item_calc['base_rate_paisa'])
+        base_amount = paisa_str(item_calc['base_paisa'])
+        rate_incl = paisa_str(item_calc['rate_paisa'])
         gst_rate = item_calc['gst_rate']
         
-        ET.SubElement(inv_entry, 'STOCKITEMNAME').text = item_calc['name']
-        ET.SubElement(inv_entry, 'ISDEEMEDPOSITIVE').text = 'No'
-        ET.SubElement(inv_entry, 'RATE').text = f'{base_rate:.2f}/Pcs'
-        ET.SubElement(inv_entry, 'AMOUNT').text = f'{base_amount:.2f}'
-        ET.SubElement(inv_entry, 'ACTUALQTY').text = f' {qty:.0f} Pcs'
-        ET.SubElement(inv_entry, 'BILLEDQTY').text = f' {qty:.0f} Pcs'
-        ET.SubElement(inv_entry, 'INCLVATRATE').text = f'{rate_incl:.2f}/Pcs'
+        parts.append(tag('STOCKITEMNAME', item_calc['name']))
+        parts.append(_STOCK_ITEM_FLAGS_XML)
+        parts.append(f'<RATE>{base_rate}/Pcs</RATE>')
+        parts.append(f'<AMOUNT>{base_amount}</AMOUNT>')
+        parts.append(f'<ACTUALQTY>{qty}</ACTUALQTY>')
+        parts.append(f'<BILLEDQTY>{qty}</BILLEDQTY>')
+        parts.append(f'<INCLVATRATE>{rate_incl}/Pcs</INCLVATRATE>')
         
-        batch = ET.SubElement(inv_entry, 'BATCHALLOCATIONS.LIST')
-        ET.SubElement(batch, 'GODOWNNAME').text = 'Main Location'
-        ET.SubElement(batch, 'BATCHNAME').text = 'Primary Batch'
-        ET.SubElement(batch, 'DESTINATIONGODOWNNAME').text = 'Main Location'
-        ET.SubElement(batch, 'TRACKINGNUMBER').text = voucher_number
-        ET.SubElement(batch, 'AMOUNT').text = f'{base_amount:.2f}'
-        ET.SubElement(batch, 'ACTUALQTY').text = f' {qty:.0f} Pcs'
-        ET.SubElement(batch, 'BILLEDQTY').text = f' {qty:.0f} Pcs'
-        ET.SubElement(batch, 'INCLVATRATE').text = f'{rate_incl:.2f}/Pcs'
+        parts.append('<BATCHALLOCATIONS.LIST>')
+        parts.append(_BATCH_HEAD_XML)
+        parts.append(tag('TRACKINGNUMBER', voucher_number))
+        parts.append(f'<AMOUNT>{base_amount}</AMOUNT>')
+        parts.append(f'<ACTUALQTY>{qty}</ACTUALQTY>')
+        parts.append(f'<BILLEDQTY>{qty}</BILLEDQTY>')
+        parts.append(f'<INCLVATRATE>{rate_incl}/Pcs</INCLVATRATE>')
+        parts.append('</BATCHALLOCATIONS.LIST>')
         
-        acc_alloc = ET.SubElement(inv_entry, 'ACCOUNTINGALLOCATIONS.LIST')
-        ET.SubElement(acc_alloc, 'LEDGERNAME').text = 'SALES GST'
-        ET.SubElement(acc_alloc, 'ISDEEMEDPOSITIVE').text = 'No'
-        ET.SubElement(acc_alloc, 'AMOUNT').text = f'{base_amount:.2f}'
+        parts.append('<ACCOUNTINGALLOCATIONS.LIST>')
+        parts.append(_SALES_ALLOCATION_HEAD_XML)
+        parts.append(f'<AMOUNT>{base_amount}</AMOUNT>')
+        parts.append('</ACCOUNTINGALLOCATIONS.LIST>')
         
-        gst_half = gst_rate / 2
-        rate_details = [
-            ('CGST', gst_half),
-            ('SGST/UTGST', gst_half),
-            ('IGST', gst_rate)
-        ]
-        for duty_head, rate_val in rate_details:
-            rate_detail = ET.SubElement(inv_entry, 'RATEDETAILS.LIST')
-            ET.SubElement(rate_detail, 'GSTRATEDUTYHEAD').text = duty_head
-            ET.SubElement(rate_detail, 'GSTRATEVALUATIONTYPE').text = 'Based on Value'
-            ET.SubElement(rate_detail, 'GSTRATE').text = f' {rate_val:.0f}'
+        parts.append(_rate_details_xml(gst_rate))
+        
+        parts.append('</ALLINVENTORYENTRIES.LIST>')
     
     # Add ledger entries
-    party_ledger = ET.SubElement(voucher, 'LEDGERENTRIES.LIST')
-    ET.SubElement(party_ledger, 'LEDGERNAME').text = party_name
-    ET.SubElement(party_ledger, 'ISDEEMEDPOSITIVE').text = 'Yes'
-    ET.SubElement(party_ledger, 'ISPARTYLEDGER').text = 'Yes'
-    ET.SubElement(party_ledger, 'AMOUNT').text = f'-{rounded_total:.2f}'
-    
-    if cgst_float > 0:
-        cgst_ledger = ET.SubElement(voucher, 'LEDGERENTRIES.LIST')
+    parts.append('<LEDGERENTRIES.LIST>')
+    parts.append(tag('LEDGERNAME', party_name))
+    parts.append(_PARTY_LEDGER_FLAGS_XML)
+    parts.append(f'<AMOUNT>{paisa_str(-rounded_total * 100)}</AMOUNT>')
+    parts.append('</LEDGERENTRIES.LIST>')
+    
+    if cgst_total > 0:
+        amount = paisa_str(cgst_total)
         gst_rate_for_ledger = int(items_calculated[0]['gst_rate'] / 2)
-        ET.SubElement(cgst_ledger, 'LEDGERNAME').text = f'CGST {gst_rate_for_ledger}%'
-        ET.SubElement(cgst_ledger, 'METHODTYPE').text = 'GST'
-        ET.SubElement(cgst_ledger, 'ISDEEMEDPOSITIVE').text = 'No'
-        ET.SubElement(cgst_ledger, 'AMOUNT').text = f'{cgst_float:.2f}'
-        ET.SubElement(cgst_ledger, 'VATEXPAMOUNT').text = f'{cgst_float:.2f}'
-    
-    if sgst_float > 0:
-        sgst_ledger = ET.SubElement(voucher, 'LEDGERENTRIES.LIST')
+        parts.append('<LEDGERENTRIES.LIST>')
+        parts.append(tag('LEDGERNAME', f'CGST {gst_rate_for_ledger}%'))
+        parts.append(_GST_LEDGER_FLAGS_XML)
+        parts.append(f'<AMOUNT>{amount}</AMOUNT>')
+        parts.append(f'<VATEXPAMOUNT>{amount}</VATEXPAMOUNT>')
+        parts.append('</LEDGERENTRIES.LIST>')
+    
+    if sgst_total > 0:
+        amount = paisa_str(sgst_total)
         gst_rate_for_ledger = int(items_calculated[0]['gst_rate'] / 2)
-        ET.SubElement(sgst_ledger, 'LEDGERNAME').text = f'SGST {gst_rate_for_ledger}%'
-        ET.SubElement(sgst_ledger, 'METHODTYPE').text = 'GST'
-        ET.SubElement(sgst_ledger, 'ISDEEMEDPOSITIVE').text = 'No'
-        ET.SubElement(sgst_ledger, 'AMOUNT').text = f'{sgst_float:.2f}'
-        ET.SubElement(sgst_ledger, 'VATEXPAMOUNT').text = f'{sgst_float:.2f}'
-    
-    if abs(round_off_float) > 0.001:
-        round_ledger = ET.SubElement(voucher, 'LEDGERENTRIES.LIST')
-        ET.SubElement(round_ledger, 'ROUNDTYPE').text = 'Normal Rounding'
-        ET.SubElement(round_ledger, 'LEDGERNAME').text = 'Round Up/Down'
-        ET.SubElement(round_ledger, 'METHODTYPE').text = 'As Total Amount Rounding'
-        ET.SubElement(round_ledger, 'ISDEEMEDPOSITIVE').text = 'No'
-        ET.SubElement(round_ledger, 'ROUNDLIMIT').text = ' 1'
-        ET.SubElement(round_ledger, 'AMOUNT').text = f'{round_off_float:.2f}'
-        ET.SubElement(round_ledger, 'VATEXPAMOUNT').text = f'{round_off_float:.2f}'
-    
-    xml_str = ET.tostring(envelope, encoding='unicode', method='xml')
-    return f'<?xml version="1.0" encoding="UTF-8"?>\n{xml_str}', voucher_number
+        parts.append('<LEDGERENTRIES.LIST>')
+        parts.append(tag('LEDGERNAME', f'SGST {gst_rate_for_ledger}%'))
+        parts.append(_GST_LEDGER_FLAGS_XML)
+        parts.append(f'<AMOUNT>{amount}</AMOUNT>')
+        parts.append(f'<VATEXPAMOUNT>{amount}</VATEXPAMOUNT>')
+        parts.append('</LEDGERENTRIES.LIST>')
+    
+    if round_off:
+        amount = paisa_str(round_off)
+        parts.append('<LEDGERENTRIES.LIST>')
+        parts.append(_ROUND_OFF_HEAD_XML)
+        parts.append(f'<AMOUNT>{amount}</AMOUNT>')
+        parts.append(f'<VATEXPAMOUNT>{amount}</VATEXPAMOUNT>')
+        parts.append('</LEDGERENTRIES.LIST>')
+    
+    parts.append('</VOUCHER></TALLYMESSAGE>')
+    return ''.join(parts), voucher_number
+
+def build_envelope(bodies, company_name=''):
+    """Wrap one or more TALLYMESSAGE blocks in a single import envelope, as UTF-8 bytes"""
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<ENVELOPE><HEADER><TALLYREQUEST>Import Data</TALLYREQUEST></HEADER>'
+             '<BODY><IMPORTDATA><REQUESTDESC><REPORTNAME>Vouchers</REPORTNAME><STATICVARIABLES>']
+    
+    if company_name:
+        parts.append(tag('SVCURRENTCOMPANY', company_name))
+    
+    parts.append('</STATICVARIABLES></REQUESTDESC><REQUESTDATA>')
+    parts.extend(bodies)
+    parts.append('</REQUESTDATA></IMPORTDATA></BODY></ENVELOPE>')
+    return ''.join(parts).encode('utf-8')
+
+def build_batch_envelope(vouchers, company_name):
+    """Build one import envelope for several vouchers, returning (xml, voucher numbers)"""
+    bodies = []
+    voucher_numbers = []
+    for voucher_data in vouchers:
+        body, voucher_number = build_voucher_body(voucher_data)
+        bodies.append(body)
+        voucher_numbers.append(voucher_number)
+    return build_envelope(bodies, company_name), voucher_numbers
+
+def create_retail_sale_xml(voucher_data):
+    """Generate XML for Retail Sale voucher matching Tally's exact format"""
+    body, voucher_number = build_voucher_body(voucher_data)
+    return build_envelope([body], voucher_data.get('companyName', '')), voucher_number
+
+REQUIRED_VOUCHER_FIELDS = (
+    ('companyName', 'Company name is required'),
+    ('partyName', 'Party name is required'),
+    ('customerName', 'Customer name is required'),
+    ('items', 'At least one item is required'),
+)
+
+# Fallback patterns for when the first tag occurrence is empty or holds markup
+_RE_LINEERROR = re.compile(rb'<LINEERROR>([^<]+)</LINEERROR>')
+_RE_ERROR = re.compile(rb'<ERROR>([^<]+)</ERROR>')
+_RE_VOUCHERNUMBER = re.compile(rb'<VOUCHERNUMBER>([^<]+)</VOUCHERNUMBER>')
+_RE_CREATED = re.compile(rb'<CREATED>([^<]+)</CREATED>')
+_TAG_PATTERNS = {
+    'LINEERROR': _RE_LINEERROR,
+    'ERROR': _RE_ERROR,
+    'VOUCHERNUMBER': _RE_VOUCHERNUMBER,
+    'CREATED': _RE_CREATED,
+}
+
+def voucher_input_error(voucher_data):
+    """Return why a voucher payload cannot be built into XML, or None if it can"""
+    for key in ('companyName', 'partyName', 'customerName', 'address', 'phone'):
+        value = voucher_data.get(key)
+        if value is not None and not isinstance(value, str):
+            return f'{key} must be text'
+    
+    date = voucher_data.get('date')
+    if not isinstance(date, str):
+        return 'Date is required'
+    try:
+        to_tally_date(date)
+    except ValueError:
+        return f'Invalid date: {date}'
+    
+    items = voucher_data['items']
+    if not isinstance(items, list):
+        return 'Items must be a list'
+    for number, item in enumerate(items, 1):
+        if not isinstance(item, dict):
+            return f'Item {number}: must be an object'
+        if not isinstance(item.get('name'), str) or not isinstance(item.get('imei') or '', str):
+            return f'Item {number}: name and IMEI must be text'
+        try:
+            qty_milli, rate_paisa, gst_bp = _calc_keys(
+                float(item['quantity']), float(item['rate']), float(item['gstRate']))
+            _calc_cached(qty_milli, rate_paisa, gst_bp)
+        except (KeyError, TypeError, ValueError, OverflowError, ZeroDivisionError):
+            return f'Item {number}: quantity, rate and GST rate must be numbers, with a non-zero quantity'
+    return None
+
+def extract_tag_text(body, name):
+    """Return the decoded text of the first <name>...</name> in a raw Tally response, or None"""
+    open_tag = f'<{name}>'.encode('ascii')
+    start = body.find(open_tag)
+    if start == -1:
+        return None
+    end = body.find(f'</{name}>'.encode('ascii'), start + len(open_tag))
+    if end != -1:
+        value = body[start + len(open_tag):end]
+        if value and b'<' not in value:
+            return value.decode('utf-8', 'replace')
+    
+    pattern = _TAG_PATTERNS.get(name)
+    match = pattern.search(body, start) if pattern else None
+    return match.group(1).decode('utf-8', 'replace') if match else None
+
+def find_all_tag_text(body, name):
+    """Return the decoded text of every <name>...</name> in a raw Tally response, in order"""
+    open_tag = f'<{name}>'.encode('ascii')
+    close_tag = f'</{name}>'.encode('ascii')
+    values = []
+    start = body.find(open_tag)
+    while start != -1:
+        start += len(open_tag)
+        end = body.find(close_tag, start)
+        if end == -1:
+            break
+        value = body[start:end]
+        if value and b'<' not in value:
+            values.append(value.decode('utf-8', 'replace'))
+        start = body.find(open_tag, end + len(close_tag))
+    return values
 
 @app.route('/get-companies', methods=['GET'])
 def get_companies():
@@ -356,23 +584,21 @@ def get_companies():
             'error': f'Error fetching companies: {str(e)}'
         }), 500
 
+@app.route('/get-companies/refresh', methods=['POST'])
+def refresh_companies():
+    """Endpoint to drop the cached company list and fetch it again from Tally"""
+    invalidate_company_cache()
+    return get_companies()
+
 @app.route('/create-voucher', methods=['POST'])
 def create_voucher():
     """Endpoint to create Retail Sale voucher in TallyPrime"""
     try:
-        voucher_data = request.json
-        
-        if not voucher_data.get('companyName'):
-            return jsonify({'success': False, 'error': 'Company name is required'}), 400
+        voucher_data = request.get_json(cache=True, silent=False)
         
-        if not voucher_data.get('partyName'):
-            return jsonify({'success': False, 'error': 'Party name is required'}), 400
-        
-        if not voucher_data.get('customerName'):
-            return jsonify({'success': False, 'error': 'Customer name is required'}), 400
-        
-        if not voucher_data.get('items') or len(voucher_data['items']) == 0:
-            return jsonify({'success': False, 'error': 'At least one item is required'}), 400
+        for key, message in REQUIRED_VOUCHER_FIELDS:
+            if not voucher_data.get(key):
+                return jsonify({'success': False, 'error': message}), 400
         
         xml_data, voucher_number = create_retail_sale_xml(voucher_data)
         
@@ -380,36 +606,30 @@ def create_voucher():
         print(f"Sending voucher to Tally: {voucher_number}")
         print(f"{'='*60}\n")
         
-        response = requests.post(
+        response = TALLY_SESSION.post(
             TALLY_URL,
-            data=xml_data.encode('utf-8'),
-            headers={'Content-Type': 'application/xml; charset=utf-8'},
+            data=xml_data,
             timeout=10
         )
         
         if response.status_code == 200:
-            response_text = response.text
-            print(f"Tally Response (first 500 chars): {response_text[:500]}")
+            response_body = response.content
+            print(f"Tally Response (first 500 bytes): {response_body[:500].decode('utf-8', 'replace')}")
             
             # Check for errors in response
-            if '<LINEERROR>' in response_text or '<ERROR>' in response_text:
-                error_match = re.search(r'<LINEERROR>([^<]+)</LINEERROR>', response_text)
-                if not error_match:
-                    error_match = re.search(r'<ERROR>([^<]+)</ERROR>', response_text)
-                
-                if error_match:
-                    error_msg = error_match.group(1)
-                    print(f"Tally Error: {error_msg}")
-                    return jsonify({
-                        'success': False,
-                        'error': f'Tally Error: {error_msg}'
-                    }), 400
+            error_msg = extract_tag_text(response_body, 'LINEERROR') or extract_tag_text(response_body, 'ERROR')
+            if error_msg:
+                print(f"Tally Error: {error_msg}")
+                return jsonify({
+                    'success': False,
+                    'error': f'Tally Error: {error_msg}'
+                }), 400
             
             # Try to get actual voucher number from response
             actual_voucher_number = voucher_number
-            vch_match = re.search(r'<VOUCHERNUMBER>([^<]+)</VOUCHERNUMBER>', response_text)
-            if vch_match:
-                actual_voucher_number = vch_match.group(1).strip()
+            vch_text = extract_tag_text(response_body, 'VOUCHERNUMBER')
+            if vch_text:
+                actual_voucher_number = vch_text.strip()
                 print(f"Voucher created: {actual_voucher_number}")
             
             # Success response
@@ -438,11 +658,128 @@ def create_voucher():
             'error': f'Server error: {str(e)}'
         }), 500
 
+@app.route('/create-vouchers', methods=['POST'])
+def create_vouchers():
+    """Endpoint to create several Retail Sale vouchers in one Tally import"""
+    try:
+        payload = request.get_json(cache=True, silent=False)
+        vouchers = payload.get('vouchers') if isinstance(payload, dict) else None
+        
+        if not isinstance(vouchers, list):
+            return jsonify({'success': False, 'error': 'Request body must be an object with a vouchers list'}), 400
+        
+        if not vouchers:
+            return jsonify({'success': False, 'error': 'At least one voucher is required'}), 400
+        
+        for index, voucher_data in enumerate(vouchers, 1):
+            if not isinstance(voucher_data, dict):
+                return jsonify({'success': False, 'error': f'Voucher {index}: must be an object'}), 400
+            for key, message in REQUIRED_VOUCHER_FIELDS:
+                if not voucher_data.get(key):
+                    return jsonify({'success': False, 'error': f'Voucher {index}: {message}'}), 400
+            # Chunks are imported one after another, so bad input must be caught
+            # before the first send rather than after earlier chunks are in Tally
+            error = voucher_input_error(voucher_data)
+            if error:
+                return jsonify({'success': False, 'error': f'Voucher {index}: {error}'}), 400
+        
+        company_name = vouchers[0]['companyName']
+        if any(voucher_data['companyName'] != company_name for voucher_data in vouchers):
+            return jsonify({
+                'success': False,
+                'error': 'All vouchers in a batch must belong to the same company'
+            }), 400
+        
+        chunks = [vouchers[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(vouchers), BATCH_CHUNK_SIZE)]
+        created_numbers = []
+        created_count = 0
+        in_flight = []
+        
+        def batch_failure(error, status, **extra):
+            # Report what Tally already imported so a retry can skip those vouchers;
+            # the failing chunk's vouchers may or may not have been imported
+            return jsonify({
+                'success': False,
+                'error': error,
+                'created': created_count,
+                'voucherNumbers': created_numbers,
+                'unconfirmedVoucherNumbers': in_flight,
+                **extra
+            }), status
+        
+        # Build the next envelope on the executor while Tally imports the current one
+        pending = EXECUTOR.submit(build_batch_envelope, chunks[0], company_name)
+        try:
+            for index in range(len(chunks)):
+                xml_data, voucher_numbers = pending.result()
+                if index + 1 < len(chunks):
+                    pending = EXECUTOR.submit(build_batch_envelope, chunks[index + 1], company_name)
+                
+                print(f"\n{'='*60}")
+                print(f"Sending {len(voucher_numbers)} vouchers to Tally: {', '.join(voucher_numbers)}")
+                print(f"{'='*60}\n")
+                
+                in_flight = voucher_numbers
+                response = TALLY_SESSION.post(
+                    TALLY_URL,
+                    data=xml_data,
+                    timeout=10 + len(voucher_numbers)
+                )
+                
+                if response.status_code != 200:
+                    return batch_failure(f'Tally returned HTTP {response.status_code}', 500)
+                
+                response_body = response.content
+                print(f"Tally Response (first 500 bytes): {response_body[:500].decode('utf-8', 'replace')}")
+                
+                # Tally keeps the valid vouchers of a batch, so report errors
+                # rather than resubmitting and risking duplicates
+                errors = find_all_tag_text(response_body, 'LINEERROR') or find_all_tag_text(response_body, 'ERROR')
+                if errors:
+                    print(f"Tally Errors: {errors}")
+                    created_text = (extract_tag_text(response_body, 'CREATED') or '0').strip()
+                    created_count += int(created_text) if created_text.isdigit() else 0
+                    return batch_failure(f'Tally Error: {errors[0]}', 400, errors=errors)
+                
+                # Prefer the voucher numbers Tally reports when it echoes all of them
+                returned_numbers = [number.strip() for number in find_all_tag_text(response_body, 'VOUCHERNUMBER')]
+                if len(returned_numbers) == len(voucher_numbers):
+                    voucher_numbers = returned_numbers
+                print(f"Vouchers created: {', '.join(voucher_numbers)}")
+                created_numbers.extend(voucher_numbers)
+                created_count += len(voucher_numbers)
+                in_flight = []
+        except requests.exceptions.ConnectionError:
+            return batch_failure('Cannot connect to TallyPrime. Make sure Tally is running and XML API is enabled on port 9000.', 500)
+        except Exception as e:
+            import traceback
+            print(traceback.format_exc())
+            return batch_failure(f'Server error: {str(e)}', 500)
+        finally:
+            # Stop building an envelope that will never be sent
+            pending.cancel()
+        
+        return jsonify({
+            'success': True,
+            'message': f'{created_count} Retail Sale vouchers created successfully',
+            'voucherNumbers': created_numbers,
+            'count': created_count,
+            'verified': True
+        }), 200
+            
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }), 500
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     try:
-        response = requests.get(f'{TALLY_URL}', timeout=2)
+        response = TALLY_SESSION.get(TALLY_URL, timeout=2)
         return jsonify({
             'server': 'running',
             'tally': 'connected'
@@ -455,8 +792,8 @@ def health():
 
 @app.route('/')
 def serve_index():
-    with open('index.html', 'r', encoding='utf-8') as f:
-        return f.read()
+    # ETag/Last-Modified let mobile clients revalidate with a 304
+    return send_from_directory(app.root_path, 'index.html', max_age=60)
 
 if __name__ == '__main__':
     import socket
@@ -476,4 +813,13 @@ if __name__ == '__main__':
     print(f"  5. GST ledgers (CGST 9%, SGST 9%, etc.) are created")
     print(f"{'='*60}\n")
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    if os.environ.get('TALLY_SERVER_DEBUG') == '1':
+        app.run(host='0.0.0.0', port=5000, debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("waitress not installed, falling back to Flask's threaded server")
+            app.run(host='0.0.0.0', port=5000, threaded=True)
+        else:
+            serve(app, host='0.0.0.0', port=5000, threads=8)